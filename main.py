@@ -1,7 +1,10 @@
-from fastapi import FastAPI, HTTPException, status
-from pydantic import BaseModel, Field
+from fastapi import Body, FastAPI, HTTPException, status
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from typing import List, Optional, Dict
-from datetime import date, timedelta
+from dataclasses import dataclass, field
+from datetime import date
 from enum import Enum
 
 # --- Enums for controlled vocabularies ---
@@ -16,34 +19,45 @@ class LeaveType(str, Enum):
     SICK = "sick"
     PERSONAL = "personal"
 
-# --- Pydantic Models for Data Validation ---
+# --- In-Memory Records ---
+# Plain dataclasses: attribute reads/writes and construction skip Pydantic
+# validation, which only happens at the request boundary (DTOs below).
 
-class LeaveBalance(BaseModel):
+@dataclass(slots=True)
+class LeaveBalance:
     allocated: int = 15
     used: int = 0
-    
-    @property
-    def remaining(self) -> int:
-        return self.allocated - self.used
+    remaining: int = 0
 
-class EmployeeBalances(BaseModel):
-    vacation: LeaveBalance = Field(default_factory=LeaveBalance)
-    sick: LeaveBalance = Field(default_factory=lambda: LeaveBalance(allocated=10))
-    personal: LeaveBalance = Field(default_factory=lambda: LeaveBalance(allocated=5))
+    def __post_init__(self) -> None:
+        self.remaining = self.allocated - self.used
 
-class Employee(BaseModel):
-    id: int
-    name: str
-    position: str
-    department: str
-    leave_balances: EmployeeBalances = Field(default_factory=EmployeeBalances)
+    def consume(self, days: int) -> None:
+        self.used += days
+        self.remaining -= days
 
-class CreateEmployee(BaseModel):
+    def release(self, days: int) -> None:
+        self.used -= days
+        self.remaining += days
+
+def default_leave_balances() -> Dict[LeaveType, LeaveBalance]:
+    """Default per-type balances for a new employee, keyed for O(1) lookup."""
+    return {
+        LeaveType.VACATION: LeaveBalance(),
+        LeaveType.SICK: LeaveBalance(allocated=10),
+        LeaveType.PERSONAL: LeaveBalance(allocated=5),
+    }
+
+@dataclass(slots=True)
+class Employee:
+    id: int
     name: str
     position: str
     department: str
+    leave_balances: Dict[LeaveType, LeaveBalance] = field(default_factory=default_leave_balances)
 
-class LeaveRequest(BaseModel):
+@dataclass(slots=True)
+class LeaveRequest:
     id: int
     employee_id: int
     leave_type: LeaveType
@@ -51,164 +65,245 @@ class LeaveRequest(BaseModel):
     end_date: date
     reason: str
     status: LeaveStatus = LeaveStatus.PENDING
+    # Populated server-side at creation so status changes never redo date arithmetic
+    business_days: int = 0
+
+# --- Pydantic Models for Request Validation ---
+
+class CreateEmployee(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    name: str
+    position: str
+    department: str
 
 class CreateLeaveRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
     leave_type: LeaveType
     start_date: date
     end_date: date
     reason: str = Field(..., max_length=300)
 
-class UpdateLeaveStatus(BaseModel):
-    status: LeaveStatus
-
-
 # --- In-Memory Databases ---
+# Seed rows are plain dataclass constructions with pre-parsed dates, so module
+# import does no validation or string coercion work.
 
 employee_db: List[Employee] = [
     Employee(id=1, name="Alice Smith", position="Software Engineer", department="Technology"),
-    Employee(id=2, name="Bob Johnson", position="HR Manager", department="Human Resources", leave_balances=EmployeeBalances(
-        vacation=LeaveBalance(allocated=20, used=5),
-        sick=LeaveBalance(allocated=10, used=1)
-    )),
+    Employee(id=2, name="Bob Johnson", position="HR Manager", department="Human Resources", leave_balances={
+        LeaveType.VACATION: LeaveBalance(allocated=20, used=5),
+        LeaveType.SICK: LeaveBalance(allocated=10, used=1),
+        LeaveType.PERSONAL: LeaveBalance(allocated=5),
+    }),
 ]
 
+employee_index: Dict[int, Employee] = {employee.id: employee for employee in employee_db}
+
 leave_db: List[LeaveRequest] = [
-    LeaveRequest(id=1, employee_id=2, leave_type=LeaveType.VACATION, start_date="2025-10-20", end_date="2025-10-22", reason="Family vacation.", status=LeaveStatus.APPROVED),
+    LeaveRequest(id=1, employee_id=2, leave_type=LeaveType.VACATION, start_date=date(2025, 10, 20), end_date=date(2025, 10, 22), reason="Family vacation.", status=LeaveStatus.APPROVED, business_days=3),
 ]
 
+leave_index: Dict[int, LeaveRequest] = {req.id: req for req in leave_db}
+leave_by_employee: Dict[int, List[LeaveRequest]] = {}
+leave_by_status: Dict[LeaveStatus, Dict[int, LeaveRequest]] = {leave_status: {} for leave_status in LeaveStatus}
+for req in leave_db:
+    leave_by_employee.setdefault(req.employee_id, []).append(req)
+    leave_by_status[req.status][req.id] = req
+
+# Monotonic id counters so inserts never rescan the lists for max(id)
+_next_employee_id: int = max((employee.id for employee in employee_db), default=0) + 1
+_next_leave_id: int = max((req.id for req in leave_db), default=0) + 1
+
+# Shared, prebuilt serializers for the list payloads
+_employees_adapter = TypeAdapter(List[Employee])
+_leave_adapter = TypeAdapter(List[LeaveRequest])
+
+# Pre-serialized payloads for the list endpoints, rebuilt lazily after any mutation
+_employees_cache: Optional[bytes] = None
+_leave_cache: Dict[Optional[LeaveStatus], bytes] = {}
+
 # --- FastAPI Application Instance ---
 app = FastAPI(
     title="HR Management API",
     description="An API to manage employees, their leave requests, and quotas.",
     version="1.2.0",
+    default_response_class=ORJSONResponse,
 )
 
+# Compress the larger (list) responses; small payloads are sent as-is
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=5)
+
 
 # --- Helper Functions ---
 
+def _invalidate_employee_cache() -> None:
+    global _employees_cache
+    _employees_cache = None
+
+def _invalidate_leave_cache() -> None:
+    _leave_cache.clear()
+
 def find_employee(employee_id: int) -> Employee:
     """Finds an employee by ID or raises HTTPException."""
-    for employee in employee_db:
-        if employee.id == employee_id:
-            return employee
-    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Employee with ID {employee_id} not found")
+    employee = employee_index.get(employee_id)
+    if employee is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Employee with ID {employee_id} not found")
+    return employee
+
+# TAIL_BUSINESS[weekday][length]: business days in a run of `length` days
+# starting on `weekday` (Monday == 0, length < 7)
+TAIL_BUSINESS = [
+    [sum(1 for offset in range(length) if (weekday + offset) % 7 < 5) for length in range(7)]
+    for weekday in range(7)
+]
 
 def calculate_business_days(start_date: date, end_date: date) -> int:
     """Calculates the number of business days (Mon-Fri) between two dates, inclusive."""
     if start_date > end_date:
         return 0
-    days = (end_date - start_date).days + 1
-    # Count the number of weekends
-    weekend_days = sum(1 for i in range(days) if (start_date + timedelta(days=i)).weekday() >= 5)
-    return days - weekend_days
+    total_days = (end_date - start_date).days + 1
+    full_weeks, remainder = divmod(total_days, 7)
+    return full_weeks * 5 + TAIL_BUSINESS[start_date.weekday()][remainder]
 
 
 # --- Root Endpoint ---
 
 @app.get("/")
-def read_root():
+async def read_root():
     """A simple root endpoint to confirm the API is running."""
     return {"message": "Welcome to the HR API!"}
 
 # --- Employee Endpoints ---
 
-@app.get("/employees", response_model=List[Employee])
-def get_all_employees():
-    return employee_db
+@app.get("/employees")
+async def get_all_employees() -> List[Employee]:
+    global _employees_cache
+    if _employees_cache is None:
+        _employees_cache = _employees_adapter.dump_json(employee_db)
+    return Response(content=_employees_cache, media_type="application/json")
 
-@app.get("/employees/{employee_id}", response_model=Employee)
-def get_employee_by_id(employee_id: int):
+@app.get("/employees/{employee_id}")
+async def get_employee_by_id(employee_id: int) -> Employee:
     return find_employee(employee_id)
 
-@app.post("/employees", response_model=Employee, status_code=status.HTTP_201_CREATED)
-def create_employee(employee_data: CreateEmployee):
-    new_id = max(emp.id for emp in employee_db) + 1 if employee_db else 1
+@app.post("/employees", status_code=status.HTTP_201_CREATED)
+async def create_employee(employee_data: CreateEmployee) -> Employee:
+    global _next_employee_id
+    new_id = _next_employee_id
+    _next_employee_id += 1
     # New employees get default leave balances
-    new_employee = Employee(id=new_id, **employee_data.dict(), leave_balances=EmployeeBalances())
+    new_employee = Employee(id=new_id, **employee_data.model_dump(), leave_balances=default_leave_balances())
     employee_db.append(new_employee)
+    employee_index[new_employee.id] = new_employee
+    _invalidate_employee_cache()
     return new_employee
 
-@app.put("/employees/{employee_id}", response_model=Employee)
-def update_employee(employee_id: int, updated_data: CreateEmployee):
+@app.put("/employees/{employee_id}")
+async def update_employee(employee_id: int, updated_data: CreateEmployee) -> Employee:
     employee = find_employee(employee_id)
     # Preserve existing leave balances when updating other details
     employee.name = updated_data.name
     employee.position = updated_data.position
     employee.department = updated_data.department
+    _invalidate_employee_cache()
     return employee
 
 @app.delete("/employees/{employee_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_employee(employee_id: int):
-    employee_to_delete = find_employee(employee_id)
-    employee_db.remove(employee_to_delete)
+async def delete_employee(employee_id: int):
+    find_employee(employee_id)
+    del employee_index[employee_id]
+    # Rebuild the list from the index (insertion-ordered) to keep it in sync
+    employee_db[:] = employee_index.values()
+    _invalidate_employee_cache()
     return
 
 # --- Quota and Leave Endpoints ---
 
-@app.get("/employees/{employee_id}/leave-balance", response_model=EmployeeBalances)
-def get_employee_leave_balance(employee_id: int):
+@app.get("/employees/{employee_id}/leave-balance")
+async def get_employee_leave_balance(employee_id: int) -> Dict[LeaveType, LeaveBalance]:
     """Retrieve the current leave balances for a specific employee."""
     employee = find_employee(employee_id)
     return employee.leave_balances
 
-@app.post("/employees/{employee_id}/leave", response_model=LeaveRequest, status_code=status.HTTP_201_CREATED)
-def create_leave_request(employee_id: int, request_data: CreateLeaveRequest):
+@app.post("/employees/{employee_id}/leave", status_code=status.HTTP_201_CREATED)
+async def create_leave_request(employee_id: int, request_data: CreateLeaveRequest) -> LeaveRequest:
     employee = find_employee(employee_id)
     
     leave_duration = calculate_business_days(request_data.start_date, request_data.end_date)
     if leave_duration <= 0:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="End date must be after start date.")
 
-    balance = getattr(employee.leave_balances, request_data.leave_type.value)
+    balance = employee.leave_balances[request_data.leave_type]
     if balance.remaining < leave_duration:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, 
                             detail=f"Insufficient {request_data.leave_type.value} leave balance. "
                                    f"Required: {leave_duration}, Available: {balance.remaining}")
 
-    new_id = max(req.id for req in leave_db) + 1 if leave_db else 1
-    new_request = LeaveRequest(id=new_id, employee_id=employee_id, **request_data.dict())
+    global _next_leave_id
+    new_id = _next_leave_id
+    _next_leave_id += 1
+    new_request = LeaveRequest(id=new_id, employee_id=employee_id, business_days=leave_duration, **request_data.model_dump())
     leave_db.append(new_request)
+    leave_index[new_request.id] = new_request
+    leave_by_employee.setdefault(employee_id, []).append(new_request)
+    leave_by_status[new_request.status][new_request.id] = new_request
+    _invalidate_leave_cache()
     return new_request
 
-@app.get("/leave", response_model=List[LeaveRequest])
-def get_all_leave_requests(status: Optional[LeaveStatus] = None):
-    if status:
-        return [req for req in leave_db if req.status == status]
-    return leave_db
-
-@app.get("/employees/{employee_id}/leave", response_model=List[LeaveRequest])
-def get_employee_leave_requests(employee_id: int):
+@app.get("/leave")
+async def get_all_leave_requests(status: Optional[LeaveStatus] = None) -> List[LeaveRequest]:
+    payload = _leave_cache.get(status)
+    if payload is None:
+        if status:
+            requests = list(leave_by_status[status].values())
+        else:
+            requests = leave_db
+        payload = _leave_adapter.dump_json(requests)
+        _leave_cache[status] = payload
+    return Response(content=payload, media_type="application/json")
+
+@app.get("/employees/{employee_id}/leave")
+async def get_employee_leave_requests(employee_id: int) -> List[LeaveRequest]:
     find_employee(employee_id)
-    return [req for req in leave_db if req.employee_id == employee_id]
+    return leave_by_employee.get(employee_id, [])
 
-@app.patch("/leave/{request_id}", response_model=LeaveRequest)
-def update_leave_request_status(request_id: int, status_update: UpdateLeaveStatus):
+@app.patch("/leave/{request_id}")
+async def update_leave_request_status(request_id: int, body: dict = Body(...)) -> LeaveRequest:
     """Update the status of a leave request and adjusts employee's leave balance if approved."""
-    request_to_update = None
-    for req in leave_db:
-        if req.id == request_id:
-            request_to_update = req
-            break
-    
+    # The body is a single enum field; constructing LeaveStatus directly avoids
+    # routing a one-key payload through a wrapper model
+    try:
+        new_status = LeaveStatus(body["status"])
+    except (KeyError, ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Body must contain a valid 'status'.")
+
+    request_to_update = leave_index.get(request_id)
     if not request_to_update:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Leave request with ID {request_id} not found")
 
     employee = find_employee(request_to_update.employee_id)
-    leave_duration = calculate_business_days(request_to_update.start_date, request_to_update.end_date)
-    balance = getattr(employee.leave_balances, request_to_update.leave_type.value)
+    leave_duration = request_to_update.business_days
+    balance = employee.leave_balances[request_to_update.leave_type]
 
     # Logic to adjust balances based on status change
-    is_newly_approved = status_update.status == LeaveStatus.APPROVED and request_to_update.status != LeaveStatus.APPROVED
-    was_previously_approved = request_to_update.status == LeaveStatus.APPROVED and status_update.status != LeaveStatus.APPROVED
+    is_newly_approved = new_status == LeaveStatus.APPROVED and request_to_update.status != LeaveStatus.APPROVED
+    was_previously_approved = request_to_update.status == LeaveStatus.APPROVED and new_status != LeaveStatus.APPROVED
 
     if is_newly_approved:
         if balance.remaining < leave_duration:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                                 detail=f"Cannot approve. Employee has insufficient {request_to_update.leave_type.value} balance.")
-        balance.used += leave_duration
+        balance.consume(leave_duration)
     elif was_previously_approved:
         # Reclaim the days if an approved request is rejected or set back to pending
-        balance.used -= leave_duration
-
-    request_to_update.status = status_update.status
+        balance.release(leave_duration)
+
+    if new_status != request_to_update.status:
+        leave_by_status[request_to_update.status].pop(request_id, None)
+        leave_by_status[new_status][request_id] = request_to_update
+        request_to_update.status = new_status
+    # Balances (served by GET /employees) may have changed along with the status
+    _invalidate_leave_cache()
+    _invalidate_employee_cache()
     return request_to_update
\ No newline at end of file